@@ -9,6 +9,10 @@ import logging
 import traceback
 import json
 import sys
+import hashlib
+import threading
+import copy
+from collections import OrderedDict
 
 # Set up logging
 logging.basicConfig(
@@ -22,17 +26,63 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+# Extra fingerprint views that can be rendered from a stored analysis
+ANALYSIS_VIEWS = ['spectrum', 'surface', 'contour']
+
+# Number of fingerprint analyses kept in memory for lazy view rendering
+MAX_STORED_ANALYSES = 256
+
+# Approximate memory budget for stored analyses and their cached views
+MAX_STORED_BYTES = 32 * 1024 * 1024
+
+# Views larger than this are returned but not cached
+MAX_CACHED_VIEW_BYTES = 1024 * 1024
+
+# HashMap size limits, matching the range offered in the UI
+MIN_MAP_SIZE = 16
+MAX_MAP_SIZE = 512
+
+def parse_analysis(content):
+    """
+    Parse the analysis file written by HashMapVisualizer.writeAnalysis
+    Returns: dict with size, bucket_distribution and collision_distribution
+    """
+    fields = {}
+    for line in content.splitlines():
+        key, sep, value = line.partition('=')
+        if sep:
+            fields[key.strip()] = value.strip()
+
+    collision_distribution = {}
+    if fields.get('collisions'):
+        for pair in fields['collisions'].split(','):
+            level, count = pair.split(':')
+            collision_distribution[int(level)] = int(count)
+
+    return {
+        'size': int(fields['size']),
+        'bucket_distribution': [int(v) for v in fields['buckets'].split(',')],
+        'collision_distribution': collision_distribution
+    }
+
+def format_analysis(analysis):
+    """Serialize an analysis dict back into the format read by HashMapVisualizer.readAnalysis"""
+    buckets = ','.join(str(v) for v in analysis['bucket_distribution'])
+    collisions = ','.join(f"{level}:{count}" for level, count in sorted(analysis['collision_distribution'].items()))
+    return f"size={analysis['size']}\nbuckets={buckets}\ncollisions={collisions}\n"
+
 # Create Java bridge class for generating fingerprints
 class JavaBridge:
     def generate_fingerprint(self, text, size, hash_function, salt_level, smooth_radius):
         """
         Generate fingerprint using Java code
-        Returns: (raw_image_bytes, enhanced_image_bytes, stats_dict)
+        Returns: (raw_image_bytes, enhanced_image_bytes, stats_dict, analysis_dict or None)
         """
         text_path = None
         raw_output = None
         enhanced_output = None
         stats_output = None
+        analysis_output = None
         temp_dir = None
 
         try:
@@ -50,6 +100,7 @@ class JavaBridge:
             raw_output = os.path.join(temp_dir, "raw_output.png")
             enhanced_output = os.path.join(temp_dir, "enhanced_output.png")
             stats_output = os.path.join(temp_dir, "stats_output.json")
+            analysis_output = os.path.join(temp_dir, "analysis_output.txt")
             
             logger.debug(f"Working directory: {os.getcwd()}")
             logger.debug(f"Output files: {raw_output}, {enhanced_output}, {stats_output}")
@@ -71,7 +122,8 @@ class JavaBridge:
                 "--smooth-radius", str(smooth_radius),
                 "--raw-output", raw_output,
                 "--enhanced-output", enhanced_output,
-                "--stats-output", stats_output
+                "--stats-output", stats_output,
+                "--analysis-output", analysis_output
             ]
             
             # For Windows, use semicolons instead of colons in classpath
@@ -133,8 +185,20 @@ class JavaBridge:
                     "smooth_radius": smooth_radius,
                     "error": "Failed to parse stats JSON"
                 }
+            
+            # The analysis is optional: without it the extra views are simply unavailable
+            analysis = None
+            if os.path.exists(analysis_output):
+                try:
+                    with open(analysis_output, 'r') as f:
+                        analysis = parse_analysis(f.read())
+                    logger.debug(f"Parsed analysis: {len(analysis['bucket_distribution'])} buckets")
+                except (KeyError, ValueError) as e:
+                    logger.error(f"Analysis parsing error: {e}")
+            else:
+                logger.warning(f"Analysis file not found: {analysis_output}")
                 
-            return raw_bytes, enhanced_bytes, stats
+            return raw_bytes, enhanced_bytes, stats, analysis
         
         except Exception as e:
             logger.error(f"Error in generate_fingerprint: {str(e)}")
@@ -143,7 +207,7 @@ class JavaBridge:
         
         finally:
             # Clean up temporary files
-            for file_path in [text_path, raw_output, enhanced_output, stats_output]:
+            for file_path in [text_path, raw_output, enhanced_output, stats_output, analysis_output]:
                 if file_path and os.path.exists(file_path):
                     try:
                         os.remove(file_path)
@@ -159,6 +223,79 @@ class JavaBridge:
                 except Exception as e:
                     logger.error(f"Failed to delete temporary directory {temp_dir}: {str(e)}")
 
+    def render_view(self, analysis, view):
+        """
+        Render an extra fingerprint view from a stored analysis using Java code
+        Returns: image bytes
+        """
+        temp_dir = None
+
+        try:
+            # Create a temporary directory
+            temp_dir = tempfile.mkdtemp()
+            logger.debug(f"Created temporary directory: {temp_dir}")
+
+            analysis_input = os.path.join(temp_dir, 'analysis_input.txt')
+            with open(analysis_input, 'w') as f:
+                f.write(format_analysis(analysis))
+
+            output_file = os.path.join(temp_dir, f"{view}_output.png")
+
+            # Get the path to the java directory
+            java_dir = os.path.join(os.getcwd(), 'java')
+
+            view_cmd = [
+                "java",
+                "-Djava.awt.headless=true",
+                "-cp", f"{java_dir}:lib/*",
+                "HashMapExperimentRunner",  # The main class with main method
+                "--analysis-input", analysis_input,
+                "--view", view,
+                "--output", output_file
+            ]
+
+            # For Windows, use semicolons instead of colons in classpath
+            if os.name == 'nt':
+                view_cmd[3] = f"{java_dir};lib/*"
+
+            logger.debug(f"Rendering view: {' '.join(view_cmd)}")
+            view_result = subprocess.run(
+                view_cmd,
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+
+            logger.debug(f"View process completed with return code: {view_result.returncode}")
+            logger.debug(f"stdout: {view_result.stdout}")
+            logger.debug(f"stderr: {view_result.stderr}")
+
+            if view_result.returncode != 0:
+                raise Exception(f"View rendering failed: {view_result.stderr}")
+
+            if not os.path.exists(output_file):
+                raise FileNotFoundError(f"Output image not found: {output_file}")
+
+            with open(output_file, 'rb') as f:
+                image_bytes = f.read()
+                logger.debug(f"Read view image: {len(image_bytes)} bytes")
+
+            return image_bytes
+
+        except Exception as e:
+            logger.error(f"Error in render_view: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise
+
+        finally:
+            # Remove the temporary directory and everything in it
+            if temp_dir and os.path.exists(temp_dir):
+                try:
+                    shutil.rmtree(temp_dir)
+                    logger.debug(f"Deleted temporary directory: {temp_dir}")
+                except Exception as e:
+                    logger.error(f"Failed to delete temporary directory {temp_dir}: {str(e)}")
+
     def run_experiment(self, experiment_type):
         """
         Run HashMap experiment and return the visualization
@@ -281,8 +418,202 @@ class JavaBridge:
                 except Exception as e:
                     logger.error(f"Failed to delete temporary directory {temp_dir}: {str(e)}")
 
+# Coalesce identical in-flight requests so they share one Java run
+class SingleFlight:
+    """
+    Run at most one computation per key at a time.
+    Callers that arrive while a computation for the same key is running
+    wait for it and receive the same result (or exception).
+    """
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+            self.waiters = 0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Call fn(*args, **kwargs) unless a call for key is already in flight
+        Returns: the result of the shared call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = SingleFlight._Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            logger.debug(f"Coalescing request onto in-flight call: {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise self._waiter_error(call.error) from call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            # Record interrupts too, so waiters never mistake an aborted call for a None result
+            call.error = e
+            raise
+        finally:
+            # Drop the key before waking waiters so later requests start fresh
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug(f"Fanning out result of {key} to {call.waiters} waiting request(s)")
+            call.done.set()
+        return call.result
+
+    @staticmethod
+    def _waiter_error(error):
+        """
+        Build a fresh exception for a waiter instead of re-raising the leader's instance,
+        which would collect every waiter's frames in one shared traceback
+        Interrupts such as KeyboardInterrupt are wrapped so they stay in the leader's thread
+        """
+        if isinstance(error, Exception):
+            try:
+                fresh = copy.copy(error)
+                if str(fresh) == str(error):
+                    return fresh
+            except Exception:
+                pass
+            return RuntimeError(str(error))
+        return RuntimeError(f"Coalesced call was interrupted: {type(error).__name__}")
+
+    def metrics(self):
+        """Return counters describing coalescing activity"""
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls)
+            }
+
+def fingerprint_key(text, size, hash_function, salt_level, smooth_radius):
+    """Build the single-flight key for a fingerprint request"""
+    text_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return ('fingerprint', text_hash, size, hash_function, salt_level, smooth_radius)
+
+def experiment_key(experiment_type):
+    """Build the single-flight key for an experiment request"""
+    return ('experiment', experiment_type)
+
+def analysis_key(text, size, hash_function):
+    """
+    Build the key a stored analysis is filed under
+    analyzeText only depends on the text, map size and hash function, so salt and smoothing are left out
+    """
+    text_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return ('analysis', text_hash, size, hash_function)
+
+def view_key(result_id, view):
+    """Build the single-flight key for an extra view request"""
+    return ('view', result_id, view)
+
+# Keep fingerprint analyses so extra views don't need another full analysis pass
+class AnalysisStore:
+    """
+    Bounded, least-recently-used store of fingerprint analyses keyed by result ID.
+    Each entry also caches the views rendered from it.
+    Both the number of entries and their approximate total size are limited.
+    """
+    def __init__(self, max_entries=MAX_STORED_ANALYSES, max_bytes=MAX_STORED_BYTES):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+
+    @staticmethod
+    def _analysis_bytes(analysis):
+        # Rough per-value cost of the bucket and collision lists
+        return 8 * (len(analysis['bucket_distribution']) + 2 * len(analysis['collision_distribution']))
+
+    def _evict(self):
+        # Caller holds the lock
+        while len(self._entries) > self.max_entries or (self.total_bytes > self.max_bytes and len(self._entries) > 1):
+            evicted, entry = self._entries.popitem(last=False)
+            self.total_bytes -= entry['bytes']
+            logger.debug(f"Evicted stored analysis: {evicted}")
+
+    def put(self, key, analysis):
+        """
+        Store an analysis under an ID derived from its analysis key
+        Returns: result ID
+        """
+        result_id = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()[:32]
+        with self._lock:
+            if result_id in self._entries:
+                self._entries.move_to_end(result_id)
+            else:
+                entry_bytes = self._analysis_bytes(analysis)
+                self._entries[result_id] = {'analysis': analysis, 'views': {}, 'bytes': entry_bytes}
+                self.total_bytes += entry_bytes
+                self._evict()
+        return result_id
+
+    def get_analysis(self, result_id):
+        """Return the stored analysis, or None if unknown or evicted"""
+        with self._lock:
+            entry = self._entries.get(result_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(result_id)
+            return entry['analysis']
+
+    def get_view(self, result_id, view):
+        """Return a cached rendered view, or None"""
+        with self._lock:
+            entry = self._entries.get(result_id)
+            return entry['views'].get(view) if entry else None
+
+    def put_view(self, result_id, view, image):
+        """Cache a rendered view if its analysis is still stored and the view is not too large"""
+        if len(image) > MAX_CACHED_VIEW_BYTES:
+            logger.debug(f"Not caching {view} view for {result_id}: {len(image)} bytes")
+            return
+        with self._lock:
+            entry = self._entries.get(result_id)
+            if entry is not None and view not in entry['views']:
+                entry['views'][view] = image
+                entry['bytes'] += len(image)
+                self.total_bytes += len(image)
+                self._entries.move_to_end(result_id)
+                self._evict()
+
+def create_bridge():
+    """
+    Pick the compute backend from HASHMAPPER_BACKEND ('java' or 'fake')
+    The fake backend lets the web tier be load tested without a JVM
+    """
+    backend = os.environ.get('HASHMAPPER_BACKEND', 'java').lower()
+    if backend == 'fake':
+        from fake_backend import FakeJavaBridge
+        bridge = FakeJavaBridge.from_env()
+        logger.info(f"Using fake backend: fingerprint_latency={bridge.fingerprint_latency}, experiment_latency={bridge.experiment_latency}, view_latency={bridge.view_latency}, error_rate={bridge.error_rate}, timeout={bridge.timeout}")
+        return bridge
+    if backend != 'java':
+        raise ValueError(f"Unknown backend: {backend}")
+    return JavaBridge()
+
 # Initialize JavaBridge
-java_bridge = JavaBridge()
+java_bridge = create_bridge()
+single_flight = SingleFlight()
+analysis_store = AnalysisStore()
 
 @app.route('/')
 def index():
@@ -327,6 +658,12 @@ def test_api():
     logger.debug("Test API endpoint called")
     return jsonify({'status': 'ok', 'message': 'API is working'})
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """API endpoint exposing request coalescing counters"""
+    logger.debug("Metrics API endpoint called")
+    return jsonify({'single_flight': single_flight.metrics()})
+
 @app.route('/api/generate-fingerprint', methods=['POST'])
 def generate_fingerprint():
     """API endpoint to generate text fingerprints"""
@@ -346,9 +683,16 @@ def generate_fingerprint():
             logger.warning("No text provided in request")
             return jsonify({'error': 'No text provided'}), 400
         
+        if not MIN_MAP_SIZE <= size <= MAX_MAP_SIZE:
+            logger.warning(f"HashMap size out of range: {size}")
+            return jsonify({'error': f'HashMap size must be between {MIN_MAP_SIZE} and {MAX_MAP_SIZE}'}), 400
+        
         # Generate fingerprint using Java bridge
         logger.debug("Calling java_bridge.generate_fingerprint()")
-        raw_image, enhanced_image, stats = java_bridge.generate_fingerprint(
+        key = fingerprint_key(text, size, hash_function, salt_level, smooth_radius)
+        raw_image, enhanced_image, stats, analysis = single_flight.do(
+            key,
+            java_bridge.generate_fingerprint,
             text, size, hash_function, salt_level, smooth_radius
         )
         
@@ -365,6 +709,11 @@ def generate_fingerprint():
             'stats': stats
         }
         
+        # Keep the analysis so extra views can be rendered on request
+        if analysis is not None:
+            response_data['result_id'] = analysis_store.put(analysis_key(text, size, hash_function), analysis)
+            response_data['views'] = ANALYSIS_VIEWS
+        
         # Validate JSON response before returning
         try:
             # Test serialize to validate
@@ -386,6 +735,59 @@ def generate_fingerprint():
         logger.error(traceback.format_exc())
         return jsonify({'error': str(e)}), 500
 
+def _render_and_cache(result_id, view, analysis):
+    """
+    Return the cached view, rendering and caching it first if needed
+    Runs inside single_flight so the cache check and fill share one in-flight window
+    """
+    # Re-check: a render may have finished between the caller's cache check and this call
+    base64_image = analysis_store.get_view(result_id, view)
+    if base64_image is not None:
+        logger.debug(f"View {view} for result ID {result_id} was cached while waiting")
+        return base64_image
+    
+    logger.debug("Calling java_bridge.render_view()")
+    image_bytes = java_bridge.render_view(analysis, view)
+    base64_image = base64.b64encode(image_bytes).decode('utf-8')
+    analysis_store.put_view(result_id, view, base64_image)
+    return base64_image
+
+@app.route('/api/fingerprint-view', methods=['POST'])
+def fingerprint_view():
+    """API endpoint to render an extra view of a previously generated fingerprint"""
+    logger.debug("Fingerprint view API endpoint called")
+    
+    try:
+        # Get form data
+        result_id = request.form.get('resultId', '')
+        view = request.form.get('view', '')
+        logger.debug(f"Request parameters: result_id={result_id}, view={view}")
+        
+        if view not in ANALYSIS_VIEWS:
+            logger.warning(f"Unknown view requested: {view}")
+            return jsonify({'error': f'Unknown view: {view}'}), 400
+        
+        analysis = analysis_store.get_analysis(result_id)
+        if analysis is None:
+            logger.warning(f"No stored analysis for result ID: {result_id}")
+            return jsonify({'error': 'Result not found, please generate the fingerprint again'}), 404
+        
+        # Serve cached views directly so they don't count as backend runs
+        base64_image = analysis_store.get_view(result_id, view)
+        if base64_image is not None:
+            logger.debug(f"Using cached {view} view for result ID: {result_id}")
+        else:
+            # Render lazily from the stored analysis, sharing the work with identical requests
+            base64_image = single_flight.do(view_key(result_id, view), _render_and_cache, result_id, view, analysis)
+        
+        logger.debug("Returning successful response")
+        return jsonify({'image': base64_image, 'view': view})
+    
+    except Exception as e:
+        logger.error(f"Error rendering fingerprint view: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/run-experiment', methods=['POST'])
 def run_experiment():
     """API endpoint to run HashMap experiments"""
@@ -398,7 +800,11 @@ def run_experiment():
         
         # Run experiment using Java bridge
         logger.debug("Calling java_bridge.run_experiment()")
-        base64_image = java_bridge.run_experiment(experiment_type)
+        base64_image = single_flight.do(
+            experiment_key(experiment_type),
+            java_bridge.run_experiment,
+            experiment_type
+        )
         logger.debug(f"Run experiment returned: base64_image={len(base64_image) if base64_image else 'None'} characters")
         
         # Create response JSON
@@ -0,0 +1,359 @@
+import base64
+import functools
+import hashlib
+import io
+import logging
+import math
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+
+from PIL import Image, ImageDraw, ImageFilter
+
+logger = logging.getLogger(__name__)
+
+# Experiment charts rendered by HashMapVisualizer are 800x600
+CHART_WIDTH = 800
+CHART_HEIGHT = 600
+
+# Rendered fingerprints and views kept so repeated inputs cost no web-tier CPU
+RENDER_CACHE_SIZE = 256
+
+
+class LatencyDistribution:
+    """
+    Samples simulated backend latencies in seconds.
+    Specs look like 'constant:1.5', 'uniform:0.5,3', 'normal:2,0.5',
+    'lognormal:0.5,0.4' (mu, sigma of the underlying normal) or 'exponential:2' (mean).
+    """
+    KINDS = {
+        'constant': 1,
+        'uniform': 2,
+        'normal': 2,
+        'lognormal': 2,
+        'exponential': 1
+    }
+
+    def __init__(self, kind, params):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        if len(params) != self.KINDS[kind]:
+            raise ValueError(f"Latency distribution '{kind}' expects {self.KINDS[kind]} parameter(s), got {len(params)}")
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def parse(cls, spec):
+        """Build a distribution from a 'kind:p1,p2' spec string"""
+        kind, _, raw_params = spec.strip().partition(':')
+        params = [float(p) for p in raw_params.split(',') if p.strip()]
+        return cls(kind.strip().lower(), params)
+
+    def sample(self, rng):
+        """Draw one latency in seconds, never negative"""
+        if self.kind == 'constant':
+            value = self.params[0]
+        elif self.kind == 'uniform':
+            value = rng.uniform(*self.params)
+        elif self.kind == 'normal':
+            value = rng.gauss(*self.params)
+        elif self.kind == 'lognormal':
+            value = rng.lognormvariate(*self.params)
+        else:
+            value = rng.expovariate(1.0 / self.params[0])
+        return max(0.0, value)
+
+    def __repr__(self):
+        return f"{self.kind}:{','.join(str(p) for p in self.params)}"
+
+
+class FakeJavaBridge:
+    """
+    Drop-in stand-in for JavaBridge that needs no JVM.
+    Returns PNGs and stats shaped like the real backend's output after a
+    simulated delay, and can inject failures and timeouts for load testing.
+    """
+    def __init__(self, fingerprint_latency='lognormal:0.0,0.4', experiment_latency='lognormal:1.0,0.3',
+                 view_latency='lognormal:-0.5,0.3', error_rate=0.0, timeout=60, seed=None):
+        self.fingerprint_latency = LatencyDistribution.parse(fingerprint_latency)
+        self.experiment_latency = LatencyDistribution.parse(experiment_latency)
+        self.view_latency = LatencyDistribution.parse(view_latency)
+        self.error_rate = error_rate
+        self.timeout = timeout
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Create a fake bridge configured through HASHMAPPER_FAKE_* environment variables"""
+        seed = os.environ.get('HASHMAPPER_FAKE_SEED')
+        return cls(
+            fingerprint_latency=os.environ.get('HASHMAPPER_FAKE_FINGERPRINT_LATENCY', 'lognormal:0.0,0.4'),
+            experiment_latency=os.environ.get('HASHMAPPER_FAKE_EXPERIMENT_LATENCY', 'lognormal:1.0,0.3'),
+            view_latency=os.environ.get('HASHMAPPER_FAKE_VIEW_LATENCY', 'lognormal:-0.5,0.3'),
+            error_rate=float(os.environ.get('HASHMAPPER_FAKE_ERROR_RATE', 0.0)),
+            timeout=float(os.environ.get('HASHMAPPER_FAKE_TIMEOUT', 60)),
+            seed=int(seed) if seed is not None else None
+        )
+
+    def _simulate(self, distribution, cmd, render, *args):
+        """
+        Return render(*args) after a sampled latency, failing the same way the real bridge would if configured to.
+        Render time counts towards the latency so the injected delay matches the configured distribution.
+        """
+        with self._rng_lock:
+            latency = distribution.sample(self._rng)
+            failed = self._rng.random() < self.error_rate
+
+        if latency > self.timeout:
+            logger.debug(f"Fake backend timing out after {self.timeout}s (sampled {latency:.3f}s)")
+            time.sleep(self.timeout)
+            raise subprocess.TimeoutExpired(cmd, self.timeout)
+
+        if failed:
+            time.sleep(latency)
+            raise Exception("Java process failed: simulated backend error")
+
+        start = time.perf_counter()
+        result = render(*args)
+        render_time = time.perf_counter() - start
+        if render_time < latency:
+            time.sleep(latency - render_time)
+        else:
+            logger.debug(f"Fake render took {render_time:.3f}s, longer than the sampled {latency:.3f}s")
+        logger.debug(f"Fake backend took {max(latency, render_time):.3f}s")
+        return result
+
+    def generate_fingerprint(self, text, size, hash_function, salt_level, smooth_radius):
+        """
+        Generate a fake fingerprint
+        Returns: (raw_image_bytes, enhanced_image_bytes, stats_dict, analysis_dict)
+        """
+        raw, enhanced, stats, analysis = self._simulate(
+            self.fingerprint_latency, ['fake', 'fingerprint'],
+            _render_fingerprint, text, size, hash_function, salt_level, smooth_radius
+        )
+        # Hand out copies so callers can't modify the cached results
+        analysis = dict(analysis, bucket_distribution=list(analysis['bucket_distribution']),
+                        collision_distribution=dict(analysis['collision_distribution']))
+        return raw, enhanced, dict(stats), analysis
+
+    def render_view(self, analysis, view):
+        """
+        Render a fake extra fingerprint view
+        Returns: image bytes
+        """
+        return self._simulate(
+            self.view_latency, ['fake', 'view', view],
+            _render_view, view, analysis['size'], tuple(analysis['bucket_distribution']),
+            tuple(sorted(analysis['collision_distribution'].items()))
+        )
+
+    def run_experiment(self, experiment_type):
+        """
+        Run a fake experiment
+        Returns: base64 encoded image
+        """
+        return self._simulate(
+            self.experiment_latency, ['fake', 'experiment', experiment_type],
+            _render_experiment, experiment_type
+        )
+
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_fingerprint(text, size, hash_function, salt_level, smooth_radius):
+    words = text.split()
+    seed = int.from_bytes(hashlib.sha256(f"{hash_function}:{text}".encode('utf-8')).digest()[:8], 'big')
+    rng = random.Random(seed)
+
+    # Hash words and characters into buckets like TextVisualizer and TextAnalyzer do
+    unique_words = list(dict.fromkeys(w for w in (re.sub('[^a-z]', '', w.lower()) for w in words) if w))
+    word_buckets = _bucket_distribution(unique_words, size, lambda w: _dumb_hash(w, hash_function, size))
+    chars = list(dict.fromkeys(c for c in text if c.isalnum()))
+    char_buckets = _bucket_distribution(chars, size, lambda c: ord(c) % size)
+
+    raw = _visual_fingerprint(word_buckets, char_buckets, size)
+    enhanced = _salt_and_smooth(raw, salt_level, smooth_radius, rng)
+
+    collision_distribution = {}
+    for count in word_buckets:
+        for level in range(1, count):
+            collision_distribution[level] = collision_distribution.get(level, 0) + 1
+    analysis = {
+        'size': size,
+        'bucket_distribution': word_buckets,
+        'collision_distribution': collision_distribution
+    }
+
+    collisions = sum(count - 1 for count in word_buckets if count > 1)
+    stats = {
+        'text_length': len(text),
+        'hash_function': hash_function,
+        'salt_level': round(float(salt_level), 2),
+        'smooth_radius': smooth_radius,
+        'total_words': len(words),
+        'unique_words': len(unique_words),
+        'collisions': collisions,
+        'max_collision_level': max(collision_distribution, default=0)
+    }
+    return _png_bytes(raw), _png_bytes(enhanced), stats, analysis
+
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_view(view, size, bucket_distribution, collision_items):
+    if view == 'spectrum':
+        # Collision spectra are JFreeChart line charts
+        image = Image.new('RGB', (CHART_WIDTH, CHART_HEIGHT), 'white')
+        draw = ImageDraw.Draw(image)
+        peak = max((count for _, count in collision_items), default=1)
+        scaled = [
+            (50 + level * (CHART_WIDTH - 100) / max(1, len(collision_items)), CHART_HEIGHT - 50 - count * (CHART_HEIGHT - 100) / peak)
+            for level, count in collision_items
+        ]
+        if len(scaled) > 1:
+            draw.line(scaled, fill='red', width=2)
+        return _png_bytes(image)
+
+    if view == 'surface':
+        return _png_bytes(_surface_image(bucket_distribution, size))
+    return _png_bytes(_contour_image(bucket_distribution, size))
+
+
+@functools.lru_cache(maxsize=None)
+def _render_experiment(experiment_type):
+    rng = random.Random(experiment_type)
+    image = Image.new('RGBA', (CHART_WIDTH, CHART_HEIGHT), 'white')
+    draw = ImageDraw.Draw(image)
+    padding = 50
+    draw.line([(padding, CHART_HEIGHT - padding), (CHART_WIDTH - padding, CHART_HEIGHT - padding)], fill='black')
+    draw.line([(padding, CHART_HEIGHT - padding), (padding, padding)], fill='black')
+    for color in ['red', 'blue', 'green', 'orange', 'magenta']:
+        points = [
+            (padding + i * (CHART_WIDTH - 2 * padding) / 9, rng.uniform(padding, CHART_HEIGHT - padding))
+            for i in range(10)
+        ]
+        draw.line(points, fill=color, width=2)
+    draw.text((CHART_WIDTH // 2 - 60, 15), f"Fake {experiment_type}", fill='black')
+
+    return base64.b64encode(_png_bytes(image)).decode('utf-8')
+
+
+def _dumb_hash(word, hash_function, size):
+    """Python port of the string branch of HashMapper.DumbHashMap.dumbHash"""
+    first, last = ord(word[0]), ord(word[-1])
+    if hash_function == 'First Character':
+        return first % size
+    if hash_function == 'First + Last Character':
+        return (first + last) % size if len(word) > 1 else first % size
+    if hash_function == 'Character Sum':
+        return sum(ord(c) for c in word) % size
+    if hash_function == 'Random':
+        return ((first * 31) ^ last) % size if len(word) > 1 else first % size
+    return len(word) % size
+
+
+def _bucket_distribution(keys, size, hash_fn):
+    buckets = [0] * size
+    for key in keys:
+        buckets[hash_fn(key)] += 1
+    return buckets
+
+
+def _visual_fingerprint(word_buckets, char_buckets, size):
+    """Mirror TextVisualizer.createVisualFingerprint: columns from words, rows from characters"""
+    max_word = max(word_buckets) or 1
+    max_char = max(char_buckets) or 1
+    word_intensity = [int(255.0 * v / max_word) for v in word_buckets]
+    char_intensity = [int(255.0 * v / max_char) for v in char_buckets]
+
+    rows = []
+    for c in char_intensity:
+        rows.append(bytes(b for w in word_intensity for b in (w, (w + c) // 4, c)))
+    return Image.frombytes('RGB', (size, size), b''.join(rows))
+
+
+def _salt_and_smooth(image, salt_level, smooth_radius, rng):
+    """Mirror TextVisualizer.saltAndSmooth: random-colour salt followed by a box blur"""
+    salted = image.copy()
+    pixels = salted.load()
+    width, height = salted.size
+    for x in range(width):
+        for y in range(height):
+            if rng.random() < salt_level:
+                pixels[x, y] = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+    if smooth_radius > 0:
+        salted = salted.filter(ImageFilter.BoxBlur(smooth_radius))
+    return salted
+
+
+def _surface_image(bucket_distribution, size):
+    """Mirror Plotter.create3DPlot"""
+    data = [
+        [math.sqrt(a * b) * math.sin(i * j / (size * size) * math.pi) if a * b > 0 else 0.0
+         for j, b in enumerate(bucket_distribution)]
+        for i, a in enumerate(bucket_distribution)
+    ]
+    lo = min(min(col) for col in data)
+    hi = max(max(col) for col in data)
+    if hi == lo:
+        hi = lo + 1.0
+
+    image = Image.new('RGB', (size, size))
+    pixels = image.load()
+    for i in range(size):
+        for j in range(size):
+            value = (data[i][j] - lo) / (hi - lo)
+            if value < 0.5:
+                green = int(value * 2 * 255)
+                pixels[i, j] = (0, green, 255 - green)
+            else:
+                red = int((value - 0.5) * 2 * 255)
+                pixels[i, j] = (red, 255 - red, 0)
+
+    # Translucent white grid, as drawn over the Java surface plot
+    grid = size // 20
+    if grid > 0:
+        overlay = image.copy()
+        draw = ImageDraw.Draw(overlay)
+        for k in range(0, size + 1, grid):
+            draw.line([(k, 0), (k, size)], fill='white')
+            draw.line([(0, k), (size, k)], fill='white')
+        image = Image.blend(image, overlay, 50 / 255)
+    return image
+
+
+def _contour_image(bucket_distribution, size):
+    """Mirror Plotter.createContourMap"""
+    data = []
+    for i, a in enumerate(bucket_distribution):
+        v1 = a / 10.0
+        column = []
+        for j, b in enumerate(bucket_distribution):
+            v2 = b / 10.0
+            column.append(math.sin(v1 * 2 * math.pi * i / size) * math.cos(v2 * 2 * math.pi * j / size) * (v1 + v2) / 2.0)
+        data.append(column)
+    lo = min(min(col) for col in data)
+    hi = max(max(max(col) for col in data), 5e-324)  # Java starts max at Double.MIN_VALUE
+    if hi == lo:
+        hi = lo + 1.0
+
+    thresholds = [k / 10.0 for k in range(1, 10)]
+    image = Image.new('RGB', (size, size))
+    pixels = image.load()
+    for i in range(size):
+        for j in range(size):
+            value = (data[i][j] - lo) / (hi - lo)
+            if any(abs(value - t) < 0.01 for t in thresholds):
+                pixels[i, j] = (0, 0, 0)
+            else:
+                pixels[i, j] = (int(value * 255), int(math.sin(value * math.pi) * 255), int((1 - value) * 255))
+    return image
+
+
+def _png_bytes(image):
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
@@ -0,0 +1,134 @@
+import java.io.*;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.util.*;
+import javax.imageio.ImageIO;
+
+/**
+ * Class to save a text analysis and render extra views from it later,
+ * so the views don't need another tokenization and hashing pass
+ */
+public class HashMapAnalysis {
+
+    /**
+     * Analyze a text file and save its bucket and collision distributions
+     */
+    public static void writeTextAnalysis(String textFile, int size, String hashFunction, String analysisOutput) {
+        try {
+            String text = new String(Files.readAllBytes(new File(textFile).toPath()), StandardCharsets.UTF_8);
+            HashMapper.setHashFunction(hashFunction);
+            Map<String, Object> analysis = HashMapper.TextAnalyzer.analyzeText(text, size);
+            writeAnalysis(analysis, size, analysisOutput);
+        } catch (IOException e) {
+            System.err.println("Error writing analysis: " + e.getMessage());
+            System.exit(1);
+        }
+    }
+
+    /**
+     * Save the distributions from TextAnalyzer.analyzeText in a simple line format:
+     * size=N, buckets=b0,b1,... and collisions=level:count,...
+     */
+    public static void writeAnalysis(Map<String, Object> analysis, int size, String analysisOutput) throws IOException {
+        int[] bucketDistribution = (int[]) analysis.get("bucketDistribution");
+        Map collisionDistribution = (Map) analysis.get("collisionDistribution");
+
+        StringBuilder buckets = new StringBuilder();
+        for (int i = 0; i < bucketDistribution.length; i++) {
+            if (i > 0) {
+                buckets.append(',');
+            }
+            buckets.append(bucketDistribution[i]);
+        }
+
+        StringBuilder collisions = new StringBuilder();
+        Iterator it = new TreeMap(collisionDistribution).entrySet().iterator();
+        while (it.hasNext()) {
+            Map.Entry entry = (Map.Entry) it.next();
+            if (collisions.length() > 0) {
+                collisions.append(',');
+            }
+            collisions.append(entry.getKey()).append(':').append(entry.getValue());
+        }
+
+        FileWriter writer = new FileWriter(analysisOutput);
+        try {
+            writer.write("size=" + size + "\n");
+            writer.write("buckets=" + buckets + "\n");
+            writer.write("collisions=" + collisions + "\n");
+        } finally {
+            writer.close();
+        }
+    }
+
+    /**
+     * Read an analysis file written by writeAnalysis
+     */
+    public static Map<String, Object> readAnalysis(String analysisFile) throws IOException {
+        Map fields = new HashMap();
+        Iterator lines = Files.readAllLines(new File(analysisFile).toPath(), StandardCharsets.UTF_8).iterator();
+        while (lines.hasNext()) {
+            String line = (String) lines.next();
+            int eq = line.indexOf('=');
+            if (eq > 0) {
+                fields.put(line.substring(0, eq).trim(), line.substring(eq + 1).trim());
+            }
+        }
+        if (!fields.containsKey("size") || !fields.containsKey("buckets")) {
+            throw new IOException("Analysis file is missing size or buckets: " + analysisFile);
+        }
+
+        int size = Integer.parseInt((String) fields.get("size"));
+        String[] bucketValues = ((String) fields.get("buckets")).split(",");
+        if (bucketValues.length != size) {
+            throw new IOException("Expected " + size + " buckets but found " + bucketValues.length);
+        }
+        int[] bucketDistribution = new int[size];
+        for (int i = 0; i < size; i++) {
+            bucketDistribution[i] = Integer.parseInt(bucketValues[i].trim());
+        }
+
+        Map collisionDistribution = new HashMap();
+        String collisions = fields.containsKey("collisions") ? (String) fields.get("collisions") : "";
+        if (collisions.length() > 0) {
+            String[] pairs = collisions.split(",");
+            for (int i = 0; i < pairs.length; i++) {
+                String[] parts = pairs[i].split(":");
+                collisionDistribution.put(
+                        Integer.valueOf(Integer.parseInt(parts[0].trim())),
+                        Integer.valueOf(Integer.parseInt(parts[1].trim())));
+            }
+        }
+
+        Map<String, Object> analysis = new HashMap<String, Object>();
+        analysis.put("size", Integer.valueOf(size));
+        analysis.put("bucketDistribution", bucketDistribution);
+        analysis.put("collisionDistribution", collisionDistribution);
+        return analysis;
+    }
+
+    /**
+     * Render a collision spectrum, 3D surface or contour view from a saved analysis
+     */
+    public static void renderAnalysisView(String analysisFile, String view, String outputFile) {
+        try {
+            Map<String, Object> analysis = readAnalysis(analysisFile);
+            int size = ((Integer) analysis.get("size")).intValue();
+            int[] bucketDistribution = (int[]) analysis.get("bucketDistribution");
+
+            if (view.equals("spectrum")) {
+                HashMapper.TextAnalyzer.generateCollisionSpectrum(analysis, outputFile);
+            } else if (view.equals("surface")) {
+                ImageIO.write(HashMapper.Plotter.create3DPlot(bucketDistribution, size), "png", new File(outputFile));
+            } else if (view.equals("contour")) {
+                ImageIO.write(HashMapper.Plotter.createContourMap(bucketDistribution, size), "png", new File(outputFile));
+            } else {
+                System.err.println("Unknown view: " + view);
+                System.exit(1);
+            }
+        } catch (IOException e) {
+            System.err.println("Error rendering view: " + e.getMessage());
+            System.exit(1);
+        }
+    }
+}
@@ -17,6 +17,9 @@ public class HashMapExperimentRunner {
             String rawOutput = null;
             String enhancedOutput = null;
             String statsOutput = null;
+            String analysisOutput = null;
+            String analysisInput = null;
+            String view = null;
             String experimentType = null;
             String output = null;
 
@@ -46,6 +49,15 @@ public class HashMapExperimentRunner {
                     case "--stats-output":
                         statsOutput = args[++i];
                         break;
+                    case "--analysis-output":
+                        analysisOutput = args[++i];
+                        break;
+                    case "--analysis-input":
+                        analysisInput = args[++i];
+                        break;
+                    case "--view":
+                        view = args[++i];
+                        break;
                     case "--type":
                         experimentType = args[++i];
                         break;
@@ -62,7 +74,16 @@ public class HashMapExperimentRunner {
                     textFile, size, hashFunction, saltLevel, smoothRadius,
                     rawOutput, enhancedOutput, statsOutput
                 );
+                if (analysisOutput != null) {
+                    // Save the analysis so extra views can be rendered without re-reading the text
+                    HashMapAnalysis.writeTextAnalysis(textFile, size, hashFunction, analysisOutput);
+                }
                 System.out.println("Text fingerprint generation completed.");
+            } else if (analysisInput != null && view != null && output != null) {
+                // Render an extra view from a saved analysis, without re-reading the text
+                System.out.println("Rendering " + view + " view...");
+                HashMapAnalysis.renderAnalysisView(analysisInput, view, output);
+                System.out.println("View rendering completed.");
             } else if (experimentType != null && output != null) {
                 // Run experiments
                 System.out.println("Running experiments...");
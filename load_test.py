@@ -0,0 +1,166 @@
+"""
+Replay a mixed fingerprint/experiment workload against a running HashMapper
+server at a target request rate and report throughput and tail latency.
+
+Start the server with the fake backend to measure the web tier on its own:
+
+    HASHMAPPER_BACKEND=fake python app.py
+    python load_test.py --rps 20 --duration 30
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+EXPERIMENT_TYPES = ['collision', 'lookup', 'distribution', 'hashFunction', 'comparison', 'textFingerprint']
+
+HASH_FUNCTIONS = ['String Length', 'First Character', 'First + Last Character', 'Character Sum', 'Random']
+
+# Requests that start sending later than this after their scheduled time count as late
+LATE_THRESHOLD_SECONDS = 0.01
+
+DEFAULT_TEXT = 'It was the best of times, it was the worst of times, it was the age of wisdom, it was the age of foolishness, it was the epoch of belief, it was the epoch of incredulity, it was the season of Light, it was the season of Darkness...'
+
+
+def build_workload(rng, count, experiment_ratio, distinct_texts):
+    """
+    Build a list of (name, path, form_data) requests.
+    distinct_texts controls how many different fingerprint inputs are used;
+    a small number reproduces many users submitting the same demo text.
+    """
+    words = DEFAULT_TEXT.split()
+    texts = [DEFAULT_TEXT] + [' '.join(rng.sample(words, len(words))) for _ in range(max(0, distinct_texts - 1))]
+
+    workload = []
+    for _ in range(count):
+        if rng.random() < experiment_ratio:
+            experiment_type = rng.choice(EXPERIMENT_TYPES)
+            workload.append(('experiment', '/api/run-experiment', {'type': experiment_type}))
+        else:
+            workload.append(('fingerprint', '/api/generate-fingerprint', {
+                'text': rng.choice(texts),
+                'size': 128,
+                'hashFunction': rng.choice(HASH_FUNCTIONS),
+                'saltLevel': 0.05,
+                'smoothRadius': 2
+            }))
+    return workload
+
+
+def send_request(base_url, path, form_data, timeout, scheduled_at):
+    """
+    POST form data and time it from its scheduled send time, so time spent
+    queued behind busy client threads counts towards latency
+    Returns: (status_code, latency_seconds, response_bytes, dispatch_lag_seconds)
+    """
+    body = urllib.parse.urlencode(form_data).encode('utf-8')
+    dispatch_lag = time.perf_counter() - scheduled_at
+    try:
+        with urllib.request.urlopen(base_url + path, data=body, timeout=timeout) as response:
+            payload = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        status = e.code
+    except Exception:
+        payload = b''
+        status = 0  # connection error or client-side timeout
+    return status, time.perf_counter() - scheduled_at, len(payload), dispatch_lag
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(results, elapsed):
+    """Aggregate per-request results into a report dict"""
+    report = {'elapsed_seconds': round(elapsed, 3)}
+    groups = {'all': results}
+    for result in results:
+        groups.setdefault(result[0], []).append(result)
+
+    for name, group in groups.items():
+        latencies = sorted(r[2] for r in group)
+        lags = sorted(r[4] for r in group)
+        ok = sum(1 for r in group if r[1] == 200)
+        report[name] = {
+            'requests': len(group),
+            'ok': ok,
+            'errors': len(group) - ok,
+            'throughput_rps': round(ok / elapsed, 2) if elapsed else 0.0,
+            'bytes': sum(r[3] for r in group),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+            'p90_ms': round(percentile(latencies, 90) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+            'max_ms': round(latencies[-1] * 1000, 1) if latencies else 0.0,
+            'late_dispatches': sum(1 for lag in lags if lag > LATE_THRESHOLD_SECONDS),
+            'p99_dispatch_lag_ms': round(percentile(lags, 99) * 1000, 1),
+            'max_dispatch_lag_ms': round(lags[-1] * 1000, 1) if lags else 0.0
+        }
+    return report
+
+
+def run_load(base_url, rps, duration, experiment_ratio, distinct_texts, max_workers, timeout, seed=None):
+    """
+    Issue requests open-loop at the target rate for the given duration
+    Returns: report dict
+    """
+    rng = random.Random(seed)
+    workload = build_workload(rng, int(rps * duration), experiment_ratio, distinct_texts)
+    results = []
+    results_lock = threading.Lock()
+
+    def worker(name, path, form_data, scheduled_at):
+        status, latency, size, lag = send_request(base_url, path, form_data, timeout, scheduled_at)
+        with results_lock:
+            results.append((name, status, latency, size, lag, scheduled_at - start + lag))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i, (name, path, form_data) in enumerate(workload):
+            # Schedule against the start time so slow responses don't lower the offered rate
+            scheduled_at = start + i / rps
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(worker, name, path, form_data, scheduled_at)
+    elapsed = time.perf_counter() - start
+
+    report = summarize(results, elapsed)
+    # Rate at which requests actually went out, to compare against the target
+    last_dispatch = max((r[5] for r in results), default=0.0)
+    report['dispatched_rps'] = round(len(results) / last_dispatch, 2) if last_dispatch else 0.0
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the HashMapper web tier')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='Base URL of the server')
+    parser.add_argument('--rps', type=float, default=10.0, help='Target requests per second')
+    parser.add_argument('--duration', type=float, default=30.0, help='Test duration in seconds')
+    parser.add_argument('--experiment-ratio', type=float, default=0.2, help='Fraction of requests that run experiments')
+    parser.add_argument('--distinct-texts', type=int, default=5, help='Number of distinct fingerprint texts')
+    parser.add_argument('--max-workers', type=int, default=200, help='Maximum concurrent requests')
+    parser.add_argument('--timeout', type=float, default=90.0, help='Client-side request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for the workload mix')
+    args = parser.parse_args()
+
+    print(f"Offering {args.rps} req/s to {args.url} for {args.duration}s...")
+    report = run_load(
+        args.url.rstrip('/'), args.rps, args.duration, args.experiment_ratio,
+        args.distinct_texts, args.max_workers, args.timeout, args.seed
+    )
+    report['target_rps'] = args.rps
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -57,6 +57,9 @@ document.addEventListener('DOMContentLoaded', function() {
     const smoothRadius = document.getElementById('smooth-radius');
     const results = document.getElementById('results');
     const loading = document.getElementById('loading');
+    const viewsPanel = document.getElementById('views-panel');
+    const viewVisualization = document.getElementById('view-visualization');
+    let currentResultId = null;
     
     generateButton.addEventListener('click', () => {
         debugLog('Generate button clicked');
@@ -162,6 +165,11 @@ document.addEventListener('DOMContentLoaded', function() {
                 statsDisplay.appendChild(statElement);
             });
             
+            // Extra views are rendered on demand from the stored analysis
+            currentResultId = data.result_id || null;
+            viewVisualization.classList.add('hidden');
+            viewsPanel.classList.toggle('hidden', !currentResultId);
+            
             // Show results
             loading.classList.add('hidden');
             results.classList.remove('hidden');
@@ -177,6 +185,52 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
     
+    // Fingerprint view buttons
+    const viewButtons = document.querySelectorAll('.view-button');
+    
+    viewButtons.forEach(button => {
+        button.addEventListener('click', () => {
+            const view = button.dataset.view;
+            debugLog('View button clicked:', view, 'result:', currentResultId);
+            
+            if (!currentResultId) {
+                return;
+            }
+            
+            viewButtons.forEach(btn => btn.disabled = true);
+            
+            // Create form data
+            const formData = new FormData();
+            formData.append('resultId', currentResultId);
+            formData.append('view', view);
+            
+            debugLog('Sending request to /api/fingerprint-view');
+            
+            fetch('/api/fingerprint-view', {
+                method: 'POST',
+                body: formData
+            })
+            .then(response => response.json())
+            .then(data => {
+                debugLog('View response received:', data.view);
+                
+                if (data.error) {
+                    throw new Error(data.error);
+                }
+                
+                document.getElementById('view-image').src = 'data:image/png;base64,' + data.image;
+                viewVisualization.classList.remove('hidden');
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                alert('Error: ' + error.message);
+            })
+            .finally(() => {
+                viewButtons.forEach(btn => btn.disabled = false);
+            });
+        });
+    });
+    
     // Experiment buttons
     // Improved experiment button handling
 const experimentButtons = document.querySelectorAll('.experiment-button');